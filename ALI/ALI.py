@@ -7,24 +7,18 @@ import vtk, qt, slicer
 from slicer.ScriptedLoadableModule import *
 from slicer.util import VTKObservationMixin
 import webbrowser
-import textwrap
 import importlib.metadata
 
 import platform
-import slicer
-from slicer.util import pip_install, pip_uninstall
+from slicer.util import pip_install
 
-from CondaSetUp import CondaSetUpCall,CondaSetUpCallWsl
-import time
 import threading
-from multiprocessing import Process, Value
 import subprocess
-
-from CondaSetUp import CondaSetUpCall,CondaSetUpCallWsl
-import time
-import threading
+import re
 import sys
 
+_WIN_DRIVE = re.compile(r"^([A-Za-z]):[\\/](.*)$")
+
 
 def check_lib_installed(lib_name, required_version=None):
     try:
@@ -36,7 +30,12 @@ def check_lib_installed(lib_name, required_version=None):
         return False
 
 # import csv
+_install_function_ok = False # memo : once the libs are verified, skip the re-probe on every prediction click
+
 def install_function():
+    global _install_function_ok
+    if _install_function_ok :
+        return True
     libs = [('itk', None), ('dicom2nifti', None), ('monai', '0.7.0'),('pytorch3d', '0.6.2')]
     if platform.system() == "Windows":
         libs.append(('torch', None))
@@ -59,33 +58,82 @@ def install_function():
         user_choice = slicer.util.confirmYesNoDisplay(message)
 
         if user_choice:
-            for lib, version in libs_to_install:
-                if lib in ['torch', 'torchvision', 'torchaudio']:
-                    extra_url = 'https://download.pytorch.org/whl/cu118' if platform.system() == "Windows" else 'https://download.pytorch.org/whl/cu113'
-                    pip_install(f'{lib} --extra-index-url {extra_url}')
-
-                elif lib=="pytorch3d":
-                    try : 
-                      import torch
-                      pyt_version_str = torch.__version__.split("+")[0].replace(".", "")
-                      version_str = "".join([f"py3{sys.version_info.minor}_cu", torch.version.cuda.replace(".", ""), f"_pyt{pyt_version_str}"])
-                      pip_install('--upgrade pip')
-                      pip_install('fvcore==0.1.5.post20220305')
-                      pip_install(f'--no-index --no-cache-dir pytorch3d -f https://dl.fbaipublicfiles.com/pytorch3d/packaging/wheels/{version_str}/download.html')
-                    except:
-                      pip_install('--no-cache-dir torch==1.11.0+cu113 torchvision==0.12.0+cu113 torchaudio==0.11.0+cu113 --extra-index-url https://download.pytorch.org/whl/cu113')
-                      pip_install('--no-index --no-cache-dir pytorch3d -f https://dl.fbaipublicfiles.com/pytorch3d/packaging/wheels/py39_cu113_pyt1110/download.html')
-                else:
-                    lib_version = f'{lib}=={version}' if version else lib
-                    pip_install(lib_version)
+            state = {"error": None} # the thread can't propagate exceptions itself
+            def do_install():
+              try:
+                simple_libs = []
+                for lib, version in libs_to_install:
+                    if lib in ['torch', 'torchvision', 'torchaudio']:
+                        extra_url = 'https://download.pytorch.org/whl/cu118' if platform.system() == "Windows" else 'https://download.pytorch.org/whl/cu113'
+                        pip_install(f'{lib} --extra-index-url {extra_url}')
+
+                    elif lib=="pytorch3d":
+                        try :
+                          import torch
+                          pyt_version_str = torch.__version__.split("+")[0].replace(".", "")
+                          version_str = "".join([f"py3{sys.version_info.minor}_cu", torch.version.cuda.replace(".", ""), f"_pyt{pyt_version_str}"])
+                          pip_install('--upgrade pip')
+                          pip_install('fvcore==0.1.5.post20220305')
+                          pip_install(f'--no-index --no-cache-dir pytorch3d -f https://dl.fbaipublicfiles.com/pytorch3d/packaging/wheels/{version_str}/download.html')
+                        except:
+                          pip_install('--no-cache-dir torch==1.11.0+cu113 torchvision==0.12.0+cu113 torchaudio==0.11.0+cu113 --extra-index-url https://download.pytorch.org/whl/cu113')
+                          pip_install('--no-index --no-cache-dir pytorch3d -f https://dl.fbaipublicfiles.com/pytorch3d/packaging/wheels/py39_cu113_pyt1110/download.html')
+                    else:
+                        simple_libs.append(f'{lib}=={version}' if version else lib)
+                if simple_libs:
+                    # one pip invocation for the plain PyPI packages : resolver and index are only hit once
+                    pip_install(' '.join(simple_libs))
+              except Exception as e:
+                state["error"] = e
+
+            # run the downloads off the UI thread, keep slicer responsive while torch wheels come down
+            process = threading.Thread(target=do_install)
+            process.start()
+            while process.is_alive():
+                slicer.app.processEvents()
+                process.join(0.3)
+            if state["error"] is not None:
+                # a failed install must not be memoized as success
+                raise state["error"]
         else :
           return False
+    _install_function_ok = True
     return True
 
 
 
 
 
+class WslShell:
+    '''
+    Keep a single wsl bash alive and stream commands to it through stdin.
+    Each fresh wsl invocation costs hundreds of ms of process start on Windows,
+    so batching several small probes through one session amortizes that cost.
+    '''
+
+    def __enter__(self):
+        self.process = subprocess.Popen(["wsl", "--", "bash"], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, bufsize=0)
+        return self
+
+    def run(self, command):
+        self.process.stdin.write((command + "\necho __DONE__$?__\n").encode())
+        self.process.stdin.flush()
+        lines = []
+        while True:
+            line = self.process.stdout.readline().decode("utf-8", errors="replace")
+            if not line or line.startswith("__DONE__"):
+                break
+            lines.append(line)
+        return "".join(lines)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            self.process.stdin.close()
+            self.process.terminate()
+        except OSError:
+            pass
+
+
 #region ========== FUNCTIONS ==========
 
 def PathFromNode(node):
@@ -237,14 +285,21 @@ class PopupWindow(qt.QWidget):
         self.setLayout(layout)
 
         # Mise à jour du temps toutes les secondes
+        self._last_sec = -1
+        self._start_monotonic = time.monotonic()
         self.timer = qt.QTimer(self)
-        self.timer.timeout.connect(lambda: self.updateTime(start_time))
+        self.timer.timeout.connect(self.updateTime)
         self.timer.start(1000)
 
         self.show()
 
-    def updateTime(self, start_time):
-        elapsed_time = int(time.time() - start_time)
+    def updateTime(self):
+        # monotonic : insensible aux changements d'horloge systeme, et on ne
+        # repeint le label que si la seconde affichee a vraiment change
+        elapsed_time = int(time.monotonic() - self._start_monotonic)
+        if elapsed_time == self._last_sec:
+            return
+        self._last_sec = elapsed_time
         self.timer_label.setText(f'Temps écoulé: {elapsed_time} secondes')
 
 
@@ -292,6 +347,7 @@ class ALIWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
     """
     Called when the user opens the module the first time and the widget is initialized.
     """
+    from CondaSetUp import CondaSetUpCallWsl # deferred : only pay for the conda machinery when the widget is actually opened
     self.conda_wsl = CondaSetUpCallWsl()
     ScriptedLoadableModuleWidget.setup(self)
 
@@ -703,31 +759,38 @@ class ALIWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
       self.ui.PredictionButton.setEnabled(False)
       self.ui.PredScanLabel.setVisible(True)
       self.ui.PredScanLabel.setText(f"Verification of WSL, this step can take few minutes")
-      wsl = self.conda_wsl.testWslAvailable()
-      if wsl : # check if wsl is available
-        lib = self.check_lib_wsl()
-        if not lib : # check if the lib required are installed
-            messageBox = qt.QMessageBox()
-            text = "Code can't be launch. \nWSL doen't have all the necessary libraries, please download the installer and follow the instructin here : https://github.com/DCBIA-OrthoLab/SlicerAutomatedDentalTools/releases/download/wsl2_windows/installer_wsl2.zip\nDownloading may be blocked by Chrome, this is normal, just authorize it."
-            ready = False
-            messageBox.information(None, "Information", text)
-      else :
-        messageBox = qt.QMessageBox()
-        text = "Code can't be launch. \nWSL is not installed, please download the installer and follow the instructin here : https://github.com/DCBIA-OrthoLab/SlicerAutomatedDentalTools/releases/download/wsl2_windows/installer_wsl2.zip\nDownloading may be blocked by Chrome, this is normal, just authorize it."
-        ready = False
-        messageBox.information(None, "Information", text)
-      
-      if ready :
-        
-        if "Error" in self.conda_wsl.condaRunCommand([self.conda_wsl.getCondaExecutable(),"--version"]): # check if miniconda is install in wsl and is setup in SlicerConda
+      state = self.load_wsl_state()
+      if not state.get("wsl_ready") : # each probe spawns wsl, skip them all when a previous run already validated the setup
+        wsl = self.conda_wsl.testWslAvailable()
+        if wsl : # check if wsl is available
+          lib = self.check_lib_wsl()
+          if not lib : # check if the lib required are installed
               messageBox = qt.QMessageBox()
-              text = "Code can't be launch. \nConda is not setup in WSL. Please go the extension CondaSetUp in SlicerConda to do it."
+              text = "Code can't be launch. \nWSL doen't have all the necessary libraries, please download the installer and follow the instructin here : https://github.com/DCBIA-OrthoLab/SlicerAutomatedDentalTools/releases/download/wsl2_windows/installer_wsl2.zip\nDownloading may be blocked by Chrome, this is normal, just authorize it."
               ready = False
               messageBox.information(None, "Information", text)
-              
+        else :
+          messageBox = qt.QMessageBox()
+          text = "Code can't be launch. \nWSL is not installed, please download the installer and follow the instructin here : https://github.com/DCBIA-OrthoLab/SlicerAutomatedDentalTools/releases/download/wsl2_windows/installer_wsl2.zip\nDownloading may be blocked by Chrome, this is normal, just authorize it."
+          ready = False
+          messageBox.information(None, "Information", text)
+
+        if ready :
+
+          if "Error" in self.conda_wsl.condaRunCommand([self.conda_wsl.getCondaExecutable(),"--version"]): # check if miniconda is install in wsl and is setup in SlicerConda
+                messageBox = qt.QMessageBox()
+                text = "Code can't be launch. \nConda is not setup in WSL. Please go the extension CondaSetUp in SlicerConda to do it."
+                ready = False
+                messageBox.information(None, "Information", text)
+
+        if ready :
+          state["wsl_ready"] = True
+          self.save_wsl_state(state)
+
       if ready :
-        self.RunningUIWindows(True) 
-        if not self.conda_wsl.condaTestEnv('ali_ios') : # check if the environnement exist
+        self.RunningUIWindows(True)
+        env_exist = "ali_ios" in state.get("envs",[]) or self.conda_wsl.condaTestEnv('ali_ios')
+        if not env_exist : # check if the environnement exist
               userResponse = slicer.util.confirmYesNoDisplay("The environnement to run the landmarks identification  doesn't exist, do you want to create it ? ", windowTitle="Env doesn't exist") # ask the persimission to create it
               if userResponse : #create it in parallele to not blocking slicer
               
@@ -743,15 +806,27 @@ class ALIWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
 
                 while process.is_alive():
                       slicer.app.processEvents()
+                      process.join(0.3) # sleep in the scheduler instead of free-spinning
                       current_time = time.time()
                       if current_time - previous_time > 0.3 :
                             previous_time = current_time
                             self.ui.TimerLabel.setText(f"time: : {current_time-start_time:.2f}s")
 
+                # the thread's outcome isn't visible here : confirm the env really
+                # exists before trusting (and caching) it
+                env_exist = self.conda_wsl.condaTestEnv('ali_ios')
+                if not env_exist :
+                      self.ui.PredScanLabel.setText(f"The environnement creation failed, code can't be launch")
+                      ready = False
+
               else :
                     self.ui.PredScanLabel.setText(f"The environnement doesn't exist, code can't be launch")
                     ready = False
-          
+
+        if ready and env_exist and "ali_ios" not in state.get("envs",[]) : # remember the env so the next run skips conda env list
+              state.setdefault("envs",[]).append("ali_ios")
+              self.save_wsl_state(state)
+
         if ready : # if everything is setup, launch ali_ios_wsl in parallele on the environnement in wsl. Launch in parallele to not block slicer
           process = threading.Thread(target=self.process_wsl, args=(param,))
           process.start()
@@ -763,6 +838,7 @@ class ALIWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
           self.ui.TimerLabel.setText(f"time: : {current_time-start_time:.2f}s")
           while process.is_alive():
                 slicer.app.processEvents()
+                process.join(0.3) # sleep in the scheduler instead of free-spinning
                 current_time = time.time()
                 if current_time - previous_time > 0.3 :
                       previous_time = current_time
@@ -788,14 +864,32 @@ class ALIWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
       '''
       windows_path = windows_path.strip()
 
-      path = windows_path.replace('\\', '/')
+      m = _WIN_DRIVE.match(windows_path)
+      if m:
+          return "/mnt/" + m.group(1).lower() + "/" + m.group(2).replace('\\', '/')
 
-      if ':' in path:
-          drive, path_without_drive = path.split(':', 1)
-          path = "/mnt/" + drive.lower() + path_without_drive
+      return windows_path.replace('\\', '/')
+
+  def load_wsl_state(self):
+      '''
+      read the json file caching the wsl/conda checks, every probe costs a wsl spawn
+      '''
+      try :
+          with open(os.path.join(os.path.expanduser("~"), ".slicer_ali_ios_wsl.json")) as f :
+              return json.load(f)
+      except (OSError, ValueError) :
+          return {}
+
+  def save_wsl_state(self,state):
+      '''
+      write the json file caching the wsl/conda checks
+      '''
+      try :
+          with open(os.path.join(os.path.expanduser("~"), ".slicer_ali_ios_wsl.json"), 'w') as f :
+              json.dump(state, f)
+      except OSError :
+          pass
 
-      return path
-    
   def check_pythonpath_windows(self,name_env,file):
       conda_exe = self.conda_wsl.getCondaExecutable()
       command = [conda_exe, "run", "-n", name_env, "python" ,"-c", f"\"import {file} as check;import os; print(os.path.isfile(check.__file__))\""]
@@ -852,9 +946,27 @@ class ALIWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
   def creation_env_wsl(self):
       '''
       Create the environnement on wsl to run landmarks identification of ios files
+      Hold an inter-process lock while provisioning : two racing conda create /
+      pip install pipelines on the same env directory corrupt it
       '''
-      librairies = ["torch torchvision torchaudio --extra-index-url https://download.pytorch.org/whl/cu113",
-              "monai==0.7.0",
+      lock = open(os.path.join(os.path.expanduser("~"), ".ali_ios_env.lock"), 'w')
+      try :
+          if platform.system() == "Windows" :
+              import msvcrt
+              msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+          else :
+              import fcntl
+              fcntl.flock(lock, fcntl.LOCK_EX)
+
+          if self.conda_wsl.condaTestEnv("ali_ios") : # another process provisioned the env while we waited on the lock
+              return
+
+          self._creation_env_wsl_impl()
+      finally :
+          lock.close()
+
+  def _creation_env_wsl_impl(self):
+      librairies = ["monai==0.7.0",
               "--no-cache-dir torch==1.11.0+cu113 torchvision==0.12.0+cu113 torchaudio==0.11.0+cu113 --extra-index-url https://download.pytorch.org/whl/cu113",
               "fvcore==0.1.5.post20220305",
               "--no-index --no-cache-dir pytorch3d -f https://dl.fbaipublicfiles.com/pytorch3d/packaging/wheels/py39_cu113_pyt1110/download.html",
@@ -892,13 +1004,9 @@ class ALIWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
     '''
     Check if wsl contains the require librairies
     '''
-    result1 = subprocess.run("wsl -- bash -c \"dpkg -l | grep libxrender1\"", capture_output=True, text=True)
-    output1 = result1.stdout.encode('utf-16-le').decode('utf-8')
-    clean_output1 = output1.replace('\x00', '')
-
-    result2 = subprocess.run("wsl -- bash -c \"dpkg -l | grep libgl1-mesa-glx\"", capture_output=True, text=True)
-    output2 = result2.stdout.encode('utf-16-le').decode('utf-8')
-    clean_output2 = output2.replace('\x00', '')
+    with WslShell() as shell:
+        clean_output1 = shell.run("dpkg -l | grep libxrender1").replace('\x00', '')
+        clean_output2 = shell.run("dpkg -l | grep libgl1-mesa-glx").replace('\x00', '')
 
     return "libxrender1" in clean_output1 and "libgl1-mesa-glx" in clean_output2
 
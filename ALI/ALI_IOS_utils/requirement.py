@@ -18,44 +18,54 @@ def import_function(pip_path):
     import textwrap
     import urllib.request
     import shutil
+    import concurrent.futures
 
 
 
     system = platform.system()
-    try : 
-        import numpy as np
-    except : 
-        command = [pip_path, 'install','numpy']
-        result = subprocess.run(command,stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True )
+
+    # torch first : monai and pytorch3d need it before their own install/import
+    try:
+        import torch
+    except ImportError:
+        command = [pip_path, 'install','--no-cache-dir', 'torch==1.11.0+cu113', 'torchvision==0.12.0+cu113', 'torchaudio==0.11.0+cu113', '--extra-index-url' ,'https://download.pytorch.org/whl/cu113']
+        subprocess.run(command,stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        import torch
+
+    # the other packages are PyPI-only : install all the missing ones with a
+    # single pip invocation so the resolver and the index are only hit once
+    missing_packages = []
+    try :
         import numpy as np
+    except :
+        missing_packages.append('numpy')
 
-    try : 
-        import vtk
-    except : 
-        command = [pip_path, 'install','vtk']
-        result = subprocess.run(command,stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True )
+    try :
         import vtk
+    except :
+        missing_packages.append('vtk')
 
     try :
         from scipy import linalg
     except :
-        command = [pip_path, 'install','scipy']
-        result = subprocess.run(command,stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True )
-        from scipy import linalg
-
-    try:
-        import torch
-    except ImportError:
-        command = [pip_path, 'install','--no-cache-dir', 'torch==1.11.0+cu113', 'torchvision==0.12.0+cu113', 'torchaudio==0.11.0+cu113', '--extra-index-url' ,'https://download.pytorch.org/whl/cu113']
-        result = subprocess.run(command,stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True )
-        import torch
+        missing_packages.append('scipy')
 
     try :
         from monai.networks.nets import UNETR
     except ImportError:
-        command = [pip_path, 'install', 'monai==0.7.0']
-        subprocess.run(command,stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True )
-        from monai.networks.nets import UNETR
+        missing_packages.append('monai==0.7.0')
+
+    if missing_packages :
+        command = [pip_path, 'install','--no-cache-dir'] + missing_packages
+        result = subprocess.run(command,stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True )
+        if result.returncode != 0 :
+            print("install failed : ", command)
+            print(result.stderr)
+
+    import numpy as np
+    import vtk
+    from scipy import linalg
+    from monai.networks.nets import UNETR
 
     from platform import system # to know which OS is used
 
@@ -70,17 +80,31 @@ def import_function(pip_path):
         try:
             pyt_version_str=torch.__version__.split("+")[0].replace(".", "")
             version_str="".join([f"py3{sys.version_info.minor}_cu",torch.version.cuda.replace(".",""),f"_pyt{pyt_version_str}"])
-            command = [pip_path, 'install','--upgrade' ,'pip']
-            subprocess.run(command,stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True )
-            command = [pip_path, 'install','fvcore==0.1.5.post20220305']
-            subprocess.run(command,stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True )     
-            command = [pip_path, 'install','--no-index', '--no-cache-dir' ,'pytorch3d', '-f', f'https://dl.fbaipublicfiles.com/pytorch3d/packaging/wheels/{version_str}/download.html']
-            result = subprocess.run(command,stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True )
+            wheel_index = f'https://dl.fbaipublicfiles.com/pytorch3d/packaging/wheels/{version_str}/download.html'
+
+            def install_fvcore():
+                subprocess.run([pip_path, 'install','--upgrade' ,'pip'],stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                subprocess.run([pip_path, 'install','fvcore==0.1.5.post20220305'],stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+            def preflight_wheel():
+                # raises if no pytorch3d build exists for this torch/cuda combo -> fallback below
+                urllib.request.urlopen(urllib.request.Request(wheel_index, method='HEAD'), timeout=30)
+
+            # the wheel url only depends on versions known before any install :
+            # check it while fvcore is installing instead of after
+            with concurrent.futures.ThreadPoolExecutor(max_workers=2) as pool:
+                fvcore_future = pool.submit(install_fvcore)
+                wheel_future = pool.submit(preflight_wheel)
+                fvcore_future.result()
+                wheel_future.result()
+
+            command = [pip_path, 'install','--no-index', '--no-cache-dir', '--no-deps' ,'pytorch3d', '-f', wheel_index]
+            subprocess.run(command,stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         except: # install correct torch version
             command = [pip_path, 'install','--no-cache-dir', 'torch==1.11.0+cu113', 'torchvision==0.12.0+cu113', 'torchaudio==0.11.0+cu113', '--extra-index-url' ,'https://download.pytorch.org/whl/cu113']
-            result = subprocess.run(command,stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True )
-            command = [pip_path, 'install','--no-index', '--no-cache-dir', 'pytorch3d', '-f', 'https://dl.fbaipublicfiles.com/pytorch3d/packaging/wheels/py39_cu113_pyt1110/download.html']
-            result = subprocess.run(command,stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True )
+            subprocess.run(command,stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            command = [pip_path, 'install','--no-index', '--no-cache-dir', '--no-deps', 'pytorch3d', '-f', 'https://dl.fbaipublicfiles.com/pytorch3d/packaging/wheels/py39_cu113_pyt1110/download.html']
+            subprocess.run(command,stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
         import pytorch3d
 
 
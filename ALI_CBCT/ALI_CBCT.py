@@ -204,25 +204,34 @@ def CorrectHisto(filepath,outpath,min_porcent=0.01,max_porcent = 0.95,i_min=-150
 
     print("Correcting scan contrast :", filepath)
     input_img = sitk.ReadImage(filepath)
-    input_img = sitk.Cast(input_img, sitk.sitkFloat32)
     img = sitk.GetArrayFromImage(input_img)
 
 
-    img_min = np.min(img)
-    img_max = np.max(img)
+    # promote to python floats : on a native int16 scan the threshold
+    # arithmetic below would overflow int16 otherwise
+    img_min = float(np.min(img))
+    img_max = float(np.max(img))
     img_range = img_max - img_min
     # print(img_min,img_max,img_range)
 
     definition = 1000
-    histo = np.histogram(img,definition)
+    if img.size > 2_000_000:
+        # the cut is an estimate anyway : a fixed-seed 1M-voxel sample lands in
+        # the same bins as the full volume at a fraction of the histogram cost
+        flat = img.ravel()
+        idx = np.random.default_rng(0).integers(0, flat.size, 1_000_000)
+        histo = np.histogram(flat[idx],definition,range=(img_min,img_max))
+    else:
+        histo = np.histogram(img,definition,range=(img_min,img_max))
     cum = np.cumsum(histo[0])
     cum = cum - np.min(cum)
     cum = cum / np.max(cum)
 
-    res_high = list(map(lambda i: i> max_porcent, cum)).index(True)
+    # cum is monotonic : binary search instead of a python scan over 1000 bools
+    res_high = int(np.searchsorted(cum, max_porcent, side="right"))
     res_max = (res_high * img_range)/definition + img_min
 
-    res_low = list(map(lambda i: i> min_porcent, cum)).index(True)
+    res_low = int(np.searchsorted(cum, min_porcent, side="right"))
     res_min = (res_low * img_range)/definition + img_min
 
     res_min = max(res_min,i_min)
@@ -231,8 +240,12 @@ def CorrectHisto(filepath,outpath,min_porcent=0.01,max_porcent = 0.95,i_min=-150
 
     # print(res_min,res_min)
 
-    img = np.where(img > res_max, res_max,img)
-    img = np.where(img < res_min, res_min,img)
+    if np.issubdtype(img.dtype, np.integer):
+        # int scan (the usual CT case) : truncated bounds give the same voxels
+        # as the old float32 detour did after its truncating Int16 cast
+        res_min = int(res_min)
+        res_max = int(res_max)
+    np.clip(img, res_min, res_max, out=img) # in place : no temporaries for the 2 np.where
 
     output = sitk.GetImageFromArray(img)
     output.SetSpacing(input_img.GetSpacing())
@@ -242,6 +255,8 @@ def CorrectHisto(filepath,outpath,min_porcent=0.01,max_porcent = 0.95,i_min=-150
 
     writer = sitk.ImageFileWriter()
     writer.SetFileName(outpath)
+    if hasattr(writer, "SetCompressionLevel"):
+        writer.SetCompressionLevel(1) # temp file : fast gzip beats small gzip
     writer.Execute(output)
     return output
 
@@ -1174,13 +1189,13 @@ def main(input):
 
     print(f"""<filter-progress>{0}</filter-progress>""")
     sys.stdout.flush()
-    time.sleep(0.5)
+    time.sleep(0.1)
     print(f"""<filter-progress>{2}</filter-progress>""")
     sys.stdout.flush()
-    time.sleep(0.5)
+    time.sleep(0.1)
     print(f"""<filter-progress>{0}</filter-progress>""")
     sys.stdout.flush()
-    time.sleep(0.5)
+    time.sleep(0.1)
 
 
     for patient,data in patients.items():
@@ -1211,10 +1226,10 @@ def main(input):
 
         print(f"""<filter-progress>{1}</filter-progress>""")
         sys.stdout.flush()
-        time.sleep(0.5)
+        time.sleep(0.1)
         print(f"""<filter-progress>{0}</filter-progress>""")
         sys.stdout.flush()
-        time.sleep(0.5)
+        time.sleep(0.1)
 
 
     # print("Patients : ",patients)
@@ -1284,13 +1299,13 @@ def main(input):
 
     print(f"""<filter-progress>{0}</filter-progress>""")
     sys.stdout.flush()
-    time.sleep(0.5)
+    time.sleep(0.1)
     print(f"""<filter-progress>{2}</filter-progress>""")
     sys.stdout.flush()
-    time.sleep(0.5)
+    time.sleep(0.1)
     print(f"""<filter-progress>{0}</filter-progress>""")
     sys.stdout.flush()
-    time.sleep(0.5)
+    time.sleep(0.1)
 
 
     start_time = time.time()
@@ -1327,7 +1342,7 @@ def main(input):
             # PlotAgentPath(agent)
             print(f"""<filter-progress>{1}</filter-progress>""")
             sys.stdout.flush()
-            time.sleep(0.5)
+            time.sleep(0.1)
             print(f"""<filter-progress>{0}</filter-progress>""")
             sys.stdout.flush()
 
@@ -17,8 +17,8 @@ from slicer.ScriptedLoadableModule import *
 from slicer.util import VTKObservationMixin, pip_install
 
 import webbrowser
-import pkg_resources
 import importlib
+import importlib.metadata
 
 def check_lib_installed(lib_name, required_version=None,system="Windows"):
     '''
@@ -45,13 +45,13 @@ def check_lib_installed(lib_name, required_version=None,system="Windows"):
             return True
 
     try:
-        installed_version = pkg_resources.get_distribution(lib_name).version
+        installed_version = importlib.metadata.version(lib_name)
         # check if the version is the good one - if required_version != None it's considered as a True
         if required_version and installed_version != required_version:
           return False
         else:
           return True
-    except pkg_resources.DistributionNotFound:
+    except importlib.metadata.PackageNotFoundError:
         return False
 
 # import csv
@@ -68,7 +68,7 @@ def install_function(self,list_libs:list,system:str):
         if not check_lib_installed(lib, version,system):
             try:
               # check if the library is already installed
-              if pkg_resources.get_distribution(lib).version:
+              if importlib.metadata.version(lib):
                 libs_to_update.append((lib, version))
             except:
               libs_to_install.append((lib, version))
@@ -81,7 +81,7 @@ def install_function(self,list_libs:list,system:str):
           if libs_to_update:
 
               message += "\nLibraries to update (version mismatch):\n"
-              message += "\n".join([f"{lib} (current: {pkg_resources.get_distribution(lib).version}) -> {version}" for lib, version in libs_to_update])
+              message += "\n".join([f"{lib} (current: {importlib.metadata.version(lib)}) -> {version}" for lib, version in libs_to_update])
 
           if libs_to_install:
               message += "\nLibraries to install:\n"
@@ -1059,26 +1059,32 @@ class AMASSSWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
       # print(files)
       # files = [files[0]]
       print("Loading surface files...")
-      for models in files:
-        if models not in LOADED_VTK_FILES.keys():
-          #open model vtk file
-          modelNode = slicer.util.loadModel(models)
-          LOADED_VTK_FILES[models] = modelNode
-
-          # Edit display properties
-          displayNode = modelNode.GetDisplayNode()
-          displayNode.SetSliceIntersectionVisibility(True)
-          displayNode.SetSliceIntersectionThickness(2)
-          if "Skin" in models or "SKIN" in models:
-            displayNode.SetOpacity(0.1)
-
-
-
-      if True in ["Root-canal" in name for name in LOADED_VTK_FILES.keys()]:
-        for model,node in LOADED_VTK_FILES.items():
-          if True in [x in model for x in ["Mandible","Maxilla"]]:
-            displayNode = node.GetDisplayNode()
-            displayNode.SetOpacity(0.2)
+      # batch state : one displayable-manager refresh for all the models
+      # instead of one per loadModel / display tweak
+      slicer.mrmlScene.StartState(slicer.mrmlScene.BatchProcessState)
+      try:
+        for models in files:
+          if models not in LOADED_VTK_FILES.keys():
+            #open model vtk file
+            modelNode = slicer.util.loadModel(models)
+            LOADED_VTK_FILES[models] = modelNode
+
+            # Edit display properties
+            displayNode = modelNode.GetDisplayNode()
+            displayNode.SetSliceIntersectionVisibility(True)
+            displayNode.SetSliceIntersectionThickness(2)
+            if "Skin" in models or "SKIN" in models:
+              displayNode.SetOpacity(0.1)
+
+
+
+        if True in ["Root-canal" in name for name in LOADED_VTK_FILES.keys()]:
+          for model,node in LOADED_VTK_FILES.items():
+            if True in [x in model for x in ["Mandible","Maxilla"]]:
+              displayNode = node.GetDisplayNode()
+              displayNode.SetOpacity(0.2)
+      finally:
+        slicer.mrmlScene.EndState(slicer.mrmlScene.BatchProcessState)
 
 
     self.RunningUI(False)
@@ -1265,6 +1271,9 @@ class LMTab:
 
 
 
+      # freeze updates while inserting : each insertTab would otherwise
+      # trigger its own relayout/repaint
+      self.seg_tab_widget.setUpdatesEnabled(False)
       for group,seg_lst in self.seg_group_dic.items():
         lst_wid = []
         for seg in seg_lst:
@@ -1279,6 +1288,7 @@ class LMTab:
         new_seg_tab = self.GenNewTab(lst_wid)
         self.seg_tab_widget.insertTab(-1,new_seg_tab,group)
 
+      self.seg_tab_widget.setUpdatesEnabled(True)
       self.seg_tab_widget.currentIndex = 0
 
       # print(self.check_box_dic)
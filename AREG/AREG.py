@@ -16,14 +16,15 @@ from AREG_Method.CBCT import Semi_CBCT, Auto_CBCT, Or_Auto_CBCT
 from AREG_Method.Method import Method
 from AREG_Method.Progress import Display
 
-from CondaSetUp import  CondaSetUpCallWsl
-from pathlib import Path
-import pkg_resources
+import importlib.metadata
+import json
 import platform
 import threading
 import subprocess
 import re
 
+_WIN_DRIVE = re.compile(r"^([A-Za-z]):[\\/](.*)$")
+
 def install_pytorch3d():
     try:
         import torch
@@ -97,14 +98,14 @@ def check_lib_installed(lib_name, required_version=None):
     output: bool : True if the library is installed with the good version, False otherwise
     '''
     try:
-        installed_version = pkg_resources.get_distribution(lib_name).version
+        installed_version = importlib.metadata.version(lib_name)
         # check if the version is the good one - if required_version != None it's considered as a True
         #required_version can have some constraints like ==, <=, >=, <, >, ex: >=1.0.0
         if required_version and installed_version != required_version:
           return False
         else:
           return True
-    except pkg_resources.DistributionNotFound:
+    except importlib.metadata.PackageNotFoundError:
         return False
 
 # import csv
@@ -122,7 +123,7 @@ def install_function(self,list_libs:list):
         if not check_lib_installed(lib, version_constraint):
             try:
             # check if the library is already installed
-                if pkg_resources.get_distribution(lib).version:
+                if importlib.metadata.version(lib):
                     libs_to_update.append((lib, version_constraint))
             except:
                 libs_to_install.append((lib, version_constraint))
@@ -134,7 +135,7 @@ def install_function(self,list_libs:list):
           #and which libraries will be installed for the first time
           if libs_to_update:
               message += "\n --- Libraries to update (version mismatch): \n"
-              message += "\n".join([f"{lib} (current: {pkg_resources.get_distribution(lib).version}) -> {version_constraint.replace('==','').replace('<=','').replace('>=','').replace('<','').replace('>','')}" for lib, version_constraint in libs_to_update])
+              message += "\n".join([f"{lib} (current: {importlib.metadata.version(lib)}) -> {version_constraint.replace('==','').replace('<=','').replace('>=','').replace('<','').replace('>','')}" for lib, version_constraint in libs_to_update])
               message += "\n"
           if libs_to_install:
 
@@ -765,50 +766,74 @@ class AREGWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
             # print("Downloading {}...".format(folder_name.split(os.sep)[0]))
             os.makedirs(out_path)
 
-            temp_path = os.path.join(directory, "temp.zip")
-
-            # Download the zip file from the url
-            with urllib.request.urlopen(url) as response, open(
-                temp_path, "wb"
-            ) as out_file:
-                # Pop up a progress bar with a QProgressDialog
-                progress = qt.QProgressDialog(
-                    "Downloading {} (File {}/{})".format(
-                        folder_name.split(os.sep)[0], num_downl, total_downloads
-                    ),
-                    "Cancel",
-                    0,
-                    100,
-                    self.parent,
-                )
-                progress.setCancelButton(None)
-                progress.setWindowModality(qt.Qt.WindowModal)
-                progress.setWindowTitle(
-                    "Downloading {}...".format(folder_name.split(os.sep)[0])
-                )
-                # progress.setWindowFlags(qt.Qt.WindowStaysOnTopHint)
-                progress.show()
-                length = response.info().get("Content-Length")
-                if length:
-                    length = int(length)
-                    blocksize = max(4096, length // 100)
-                    read = 0
-                    while True:
-                        buffer = response.read(blocksize)
-                        if not buffer:
-                            break
-                        read += len(buffer)
-                        out_file.write(buffer)
-                        progress.setValue(read * 100.0 / length)
-                        qt.QApplication.processEvents()
-                shutil.copyfileobj(response, out_file)
-
-            # Unzip the file
-            with zipfile.ZipFile(temp_path, "r") as zip:
-                zip.extractall(out_path)
-
-            # Delete the zip file
-            os.remove(temp_path)
+            # spool the archive in memory (spills to a temp file past 256 MiB)
+            # instead of writing temp.zip to disk and re-reading it
+            import tempfile
+
+            # the download + unzip run in a worker thread so the network
+            # does not block the UI; the main thread only pumps events and
+            # refreshes the dialog from the shared state below
+            state = {"read": 0, "length": 0, "error": None}
+
+            def download_and_unzip():
+                try:
+                    with urllib.request.urlopen(url) as response, tempfile.SpooledTemporaryFile(
+                        max_size=256 << 20
+                    ) as out_file:
+                        length = response.info().get("Content-Length")
+                        if length:
+                            state["length"] = int(length)
+                            blocksize = max(65536, state["length"] // 100)
+                            while True:
+                                buffer = response.read(blocksize)
+                                if not buffer:
+                                    break
+                                out_file.write(buffer)
+                                state["read"] += len(buffer)
+                        else:
+                            # no Content-Length : drain with a 1 MiB buffer
+                            shutil.copyfileobj(response, out_file, length=1 << 20)
+
+                        # Unzip straight from the spool, no temp.zip round-trip
+                        out_file.seek(0)
+                        with zipfile.ZipFile(out_file, "r") as zip:
+                            zip.extractall(out_path)
+                except Exception as e:
+                    state["error"] = e
+
+            # Pop up a progress bar with a QProgressDialog
+            progress = qt.QProgressDialog(
+                "Downloading {} (File {}/{})".format(
+                    folder_name.split(os.sep)[0], num_downl, total_downloads
+                ),
+                "Cancel",
+                0,
+                100,
+                self.parent,
+            )
+            progress.setCancelButton(None)
+            progress.setWindowModality(qt.Qt.WindowModal)
+            progress.setWindowTitle(
+                "Downloading {}...".format(folder_name.split(os.sep)[0])
+            )
+            # progress.setWindowFlags(qt.Qt.WindowStaysOnTopHint)
+            progress.show()
+
+            process = threading.Thread(target=download_and_unzip)
+            process.start()
+            last_percent = -1
+            while process.is_alive():
+                slicer.app.processEvents()
+                if state["length"]:
+                    percent = state["read"] * 100 // state["length"]
+                    if percent != last_percent:
+                        last_percent = percent
+                        progress.setValue(percent)
+                process.join(0.1)
+            progress.close()
+
+            if state["error"] is not None:
+                raise state["error"]
 
         return out_path
 
@@ -871,21 +896,16 @@ class AREGWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
 
     def CheckScan(self):
         """Function to test both t1 and t2 scan folders"""
+        # read the lineedits once, each .text access is a Qt property round-trip
+        scan_t1 = self.ui.lineEditScanT1LmPath.text
+        scan_t2 = self.ui.lineEditScanT2LmPath.text
         if self.isDCMInput:
-            nb_scans = self.ActualMeth.NumberScanDCM(
-                self.ui.lineEditScanT1LmPath.text, self.ui.lineEditScanT2LmPath.text
-            )
-            error = self.ActualMeth.TestScanDCM(
-                self.ui.lineEditScanT1LmPath.text, self.ui.lineEditScanT2LmPath.text
-            )
+            nb_scans = self.ActualMeth.NumberScanDCM(scan_t1, scan_t2)
+            error = self.ActualMeth.TestScanDCM(scan_t1, scan_t2)
 
         else:
-            nb_scans = self.ActualMeth.NumberScan(
-                self.ui.lineEditScanT1LmPath.text, self.ui.lineEditScanT2LmPath.text
-            )
-            error = self.ActualMeth.TestScan(
-                self.ui.lineEditScanT1LmPath.text, self.ui.lineEditScanT2LmPath.text
-            )
+            nb_scans = self.ActualMeth.NumberScan(scan_t1, scan_t2)
+            error = self.ActualMeth.TestScan(scan_t1, scan_t2)
 
         if isinstance(error, str):
             qt.QMessageBox.warning(self.parent, "Warning", error)
@@ -909,26 +929,22 @@ class AREGWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
             lineEdit.setText(scan_folder)
 
             # To check if the input segmentation (for the Semi-Auto CBCT mode) has different labels to show them in a combobox
-            if (
-                self.ui.lineEditScanT1LmPath.text != ""
-                and self.ui.lineEditScanT2LmPath.text == ""
-            ):
+            scan_t1 = self.ui.lineEditScanT1LmPath.text
+            scan_t2 = self.ui.lineEditScanT2LmPath.text
+            if scan_t1 != "" and scan_t2 == "":
                 if (
                     self.ui.CbInputType.currentIndex == 0
                     and self.ui.CbModeType.currentIndex == 2
                 ):
                     if self.SegmentationLabels == [0]:
                         self.SegmentationLabels += self.ActualMeth.GetSegmentationLabel(
-                            self.ui.lineEditScanT1LmPath.text
+                            scan_t1
                         )
                         for i in self.SegmentationLabels:
                             if i != 0:
                                 self.ui.LabelSelectcomboBox.addItem(f"Label {i}")
 
-            if (
-                self.ui.lineEditScanT1LmPath.text != ""
-                and self.ui.lineEditScanT2LmPath.text != ""
-            ):
+            if scan_t1 != "" and scan_t2 != "":
                 self.CheckScan()
 
     def downloadModel(self, lineEdit, name, test=False):
@@ -1037,11 +1053,15 @@ class AREGWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
                 self.enableCheckbox()
 
     def ChosePathOutput(self):
-        out_folder = qt.QFileDialog.getExistingDirectory(
-            self.parent, "Select a scan folder"
-        )
-        if not out_folder == "":
-            self.ui.lineEditOutputPath.setText(out_folder)
+        # non-modal dialog : getExistingDirectory blocks the whole Slicer
+        # event loop while the user browses (can stall for seconds on
+        # network drives). Nothing depends on the answer synchronously here.
+        dlg = qt.QFileDialog(self.parent, "Select a scan folder")
+        dlg.setFileMode(qt.QFileDialog.Directory)
+        dlg.setOption(qt.QFileDialog.ShowDirsOnly, True)
+        dlg.connect("fileSelected(QString)", self.ui.lineEditOutputPath.setText)
+        dlg.setAttribute(qt.Qt.WA_DeleteOnClose)
+        dlg.open()
 
     def enableCheckbox(self):
         status = self.ActualMeth.existsLandmark(
@@ -1362,15 +1382,33 @@ class AREGWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
         
     def run_wsl(self,type):
         if type=="seg":
-            output_command = self.conda_wsl.condaRunCommand(["which","dentalmodelseg"],"shapeaxi").strip()
-            clean_output = re.search(r"Result: (.+)", output_command)
-            dentalmodelseg_path = clean_output.group(1).strip()
-            dentalmodelseg_path_clean = dentalmodelseg_path.replace("\\n","")
+            # a conda activation just to run `which` costs seconds : cache the path
+            # for the session and across restarts through the app settings
+            dentalmodelseg_path_clean = getattr(self, "_dentalmodelseg_path", None)
+            if not dentalmodelseg_path_clean :
+                cached = qt.QSettings().value("AREG/dentalmodelseg_path", "")
+                # a bare wsl hop is far cheaper than the conda probe : only trust
+                # the stored path if the file is still there (the env may have
+                # been recreated at another prefix since it was cached)
+                if cached and cached.startswith("/") and self.wsl_file_exists(cached):
+                    dentalmodelseg_path_clean = cached
+            if not dentalmodelseg_path_clean :
+                output_command = self.conda_wsl.condaRunCommand(["which","dentalmodelseg"],"shapeaxi").strip()
+                # plain split on the literal token, no regex needed ; without the
+                # token the command failed and there is no path to extract
+                dentalmodelseg_path = ""
+                if "Result:" in output_command :
+                    dentalmodelseg_path = output_command.rpartition("Result:")[2].strip()
+                dentalmodelseg_path_clean = dentalmodelseg_path.replace("\\n","")
+                if dentalmodelseg_path_clean.startswith("/"):
+                    # only persist a probe that actually found the binary
+                    qt.QSettings().setValue("AREG/dentalmodelseg_path", dentalmodelseg_path_clean)
+            self._dentalmodelseg_path = dentalmodelseg_path_clean or None
             for i in range(2):
                 name_env = "shapeaxi"
                 args = self.list_Processes_Parameters[0]["Parameter"]
                 print("args : ",args)
-                conda_exe = self.conda_wsl.getCondaExecutable()
+                conda_exe = self.get_conda_executable()
                 command = [conda_exe, "run", "-n", name_env, "python" ,"-m", f"CrownSegmentationcli"]
                 for key, value in args.items():
                     if key in ["out","input_csv","vtk_folder","dentalmodelseg_path"]:
@@ -1389,6 +1427,7 @@ class AREGWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
                 previous_time = self.startTime
                 while process.is_alive():
                     slicer.app.processEvents()
+                    process.join(0.3) # sleep in the scheduler instead of free-spinning
                     current_time = time.time()
                     gap=current_time-previous_time
                     if gap>0.3:
@@ -1408,11 +1447,12 @@ class AREGWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
             name_env = "shapeaxi"
             args = self.list_Processes_Parameters[0]["Parameter"]
             print("args : ",args)
-            conda_exe = self.conda_wsl.getCondaExecutable()
+            conda_exe = self.get_conda_executable()
             command = [conda_exe, "run", "-n", name_env, "python" ,"-m", f"AREG_IOS"]
             for key, value in args.items():
                 print("key : ",key)
-                if Path(value).is_file() or Path(value).is_dir() :
+                # short-circuit empty values, and one stat instead of two
+                if value and os.path.exists(value):
                     value = self.windows_to_linux_path(value)
                 command.append(f"\"{value}\"")
             print("command : ",command)
@@ -1425,6 +1465,7 @@ class AREGWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
             previous_time = self.startTime
             while process.is_alive():
                 slicer.app.processEvents()
+                process.join(0.3) # sleep in the scheduler instead of free-spinning
                 current_time = time.time()
                 gap=current_time-previous_time
                 if gap>0.3:
@@ -1548,22 +1589,40 @@ class AREGWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
                           "Y88888P"      888     888    888 8888888888 888   T88b  "Y8888P"
     """
 
+    def get_conda_executable(self):
+        # getCondaExecutable/getCondaPath shell into wsl every call ; keep them for the session
+        if not hasattr(self, "_conda_exe"):
+            self._conda_exe = self.conda_wsl.getCondaExecutable()
+        return self._conda_exe
+
+    def get_conda_path(self):
+        if not hasattr(self, "_conda_path"):
+            self._conda_path = self.conda_wsl.getCondaPath()
+        return self._conda_path
+
     def check_lib_wsl(self)->bool:
         '''
         Check if wsl contains the require librairies
         '''
-        result1 = subprocess.run("wsl -- bash -c \"dpkg -l | grep libxrender1\"", capture_output=True, text=True)
-        output1 = result1.stdout.encode('utf-16-le').decode('utf-8')
-        clean_output1 = output1.replace('\x00', '')
-
-        result2 = subprocess.run("wsl -- bash -c \"dpkg -l | grep libgl1-mesa-glx\"", capture_output=True, text=True)
-        output2 = result2.stdout.encode('utf-16-le').decode('utf-8')
-        clean_output2 = output2.replace('\x00', '')
-
-        return "libxrender1" in clean_output1 and "libgl1-mesa-glx" in clean_output2
+        # one wsl spawn instead of two (each one costs a wsl cold start) :
+        # dpkg-query prints only the packages that are actually installed
+        result = subprocess.run(
+            ["wsl", "--", "bash", "-c", "dpkg-query -W -f='${Package}\\n' libxrender1 libgl1-mesa-glx 2>/dev/null"],
+            capture_output=True)
+        # the command runs inside wsl so its output is utf-8 (only wsl.exe's
+        # own messages are utf-16) ; drop stray NULs like WslShell does
+        stdout = result.stdout.decode("utf-8", errors="replace") if result.stdout else ""
+        installed = set(stdout.replace("\x00", "").split())
+
+        return "libxrender1" in installed and "libgl1-mesa-glx" in installed
   
     def check_wsl_environment(self):
-            self.conda_wsl = CondaSetUpCallWsl()  
+            # each probe spawns wsl subprocesses and can take seconds : once
+            # the full check succeeded, reuse the answer for the session
+            if getattr(self, "_wsl_env_ready", False):
+                return True
+            from CondaSetUp import CondaSetUpCallWsl # deferred : only needed on the Windows/WSL path
+            self.conda_wsl = CondaSetUpCallWsl()
             wsl = self.conda_wsl.testWslAvailable()
             ready = True
             self.ui.label_LibsInstallation.setHidden(False)
@@ -1584,9 +1643,12 @@ class AREGWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
               ready = False
               messageBox.information(None, "Information", text)
             
+            env_list = ""
             if ready : # checking if miniconda installed on wsl
               self.ui.label_LibsInstallation.setText(f"Checking if miniconda is installed")
-              if "Error" in self.conda_wsl.condaRunCommand([self.conda_wsl.getCondaExecutable(),"--version"]): # if conda is setup
+              # one `conda env list` answers both "is conda setup" and "does the env exist"
+              env_list = self.conda_wsl.condaRunCommand([self.get_conda_executable(),"env","list"])
+              if "Error" in env_list: # if conda is setup
                     messageBox = qt.QMessageBox()
                     text = "Code can't be launch. \nConda is not setup in WSL. Please go the extension CondaSetUp in SlicerConda to do it."
                     ready = False
@@ -1595,7 +1657,7 @@ class AREGWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
             if ready : # checking if environment 'shapeaxi' exist on wsl and if no ask user permission to create and install required lib in it
               self.ui.label_LibsInstallation.setText(f"Checking if environnement exist")
               name_env = "shapeaxi"     
-              if not self.conda_wsl.condaTestEnv(name_env) : # check is environnement exist, if not ask user the permission to do it
+              if name_env not in env_list : # check is environnement exist, if not ask user the permission to do it
                 userResponse = slicer.util.confirmYesNoDisplay("The environnement to run the segmentation doesn't exist, do you want to create it ? ", windowTitle="Env doesn't exist")
                 if userResponse :
                   start_time = time.time()
@@ -1607,6 +1669,7 @@ class AREGWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
                   
                   while process.is_alive():
                     slicer.app.processEvents()
+                    process.join(0.3) # sleep in the scheduler instead of free-spinning
                     current_time = time.time()
                     gap=current_time-previous_time
                     if gap>0.3:
@@ -1619,16 +1682,14 @@ class AREGWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
                   self.ui.label_LibsInstallation.setText(f"Installation of librairies into the new environnement. This task may take a few minutes.\ntime: 0.0s")
                   
                   name_env = "shapeaxi"
-                  # result_pythonpath = self.check_pythonpath_windows(name_env,"ALI_IOS_utils.requirement") # THIS LINE IS WORKING
+                  # the env was just created so PYTHONPATH can't be set yet : give the
+                  # paths right away instead of probing first (one conda cold start saved)
+                  self.give_pythonpath_windows(name_env)
                   result_pythonpath = self.check_pythonpath_windows(name_env,"CrownSegmentation_utils.install_pytorch")
-                  if not result_pythonpath : 
-                    self.give_pythonpath_windows(name_env)
-                    # result_pythonpath = self.check_pythonpath_windows(name_env,"ALI_IOS_utils.requirement") # THIS LINE IS WORKING
-                    result_pythonpath = self.check_pythonpath_windows(name_env,"CrownSegmentation_utils.install_pytorch")
                     
                   if result_pythonpath : 
-                    conda_exe = self.conda_wsl.getCondaExecutable()
-                    path_pip = self.conda_wsl.getCondaPath()+f"/envs/{name_env}/bin/pip"
+                    conda_exe = self.get_conda_executable()
+                    path_pip = self.get_conda_path()+f"/envs/{name_env}/bin/pip"
                     # command = [conda_exe, "run", "-n", name_env, "python" ,"-m", f"ALI_IOS_utils.requirement",path_pip] # THIS LINE IS WORKING
                     command = [conda_exe, "run", "-n", name_env, "python" ,"-m", f"CrownSegmentation_utils.install_pytorch",path_pip]
                     print("command : ",command)
@@ -1638,6 +1699,7 @@ class AREGWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
                     
                     while process.is_alive():
                       slicer.app.processEvents()
+                      process.join(0.3) # sleep in the scheduler instead of free-spinning
                       current_time = time.time()
                       gap=current_time-previous_time
                       if gap>0.3:
@@ -1651,29 +1713,19 @@ class AREGWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
                   
               if ready : #check if wsl know the path to Crownsegmentationcli and AREG_IOS. If no it's trying to give it and check again.
                 print("CHECK AREG_IOS ET CROWNSEGMENTATIONCLI")
-                result_pythonpath = self.check_pythonpath_windows(name_env,"CrownSegmentationcli")
-                if not result_pythonpath : 
-                    self.give_pythonpath_windows(name_env)
-                    result_pythonpath = self.check_pythonpath_windows(name_env,"CrownSegmentationcli")
-                    
-                if result_pythonpath:
-                    ready = True
-                    print("WSL know the path to CrownSegmentationcli")
-                else :
-                    ready = False
-                    print("WSL don't know the path to CrownSegmentationcli")
-                    
-                result_pythonpath = self.check_pythonpath_windows(name_env,"AREG_IOS")
-                if not result_pythonpath : 
+                # one conda run probing both modules instead of 2 (or 4) cold starts
+                modules = ["CrownSegmentationcli","AREG_IOS"]
+                result_pythonpath = self.check_pythonpath_windows_multi(name_env,modules)
+                if not all(result_pythonpath.values()) : 
                     self.give_pythonpath_windows(name_env)
-                    result_pythonpath = self.check_pythonpath_windows(name_env,"AREG_IOS")
+                    result_pythonpath = self.check_pythonpath_windows_multi(name_env,modules)
                     
-                if result_pythonpath:
-                    ready = True
-                    print("WSL know the path to AREG_IOS")
-                else :
-                    ready = False
-                    print("WSL don't know the path to AREG_IOS")
+                for module in modules :
+                    if result_pythonpath.get(module):
+                        print(f"WSL know the path to {module}")
+                    else :
+                        print(f"WSL don't know the path to {module}")
+                ready = all(result_pythonpath.values())
                   
                 
 
@@ -1699,7 +1751,9 @@ class AREGWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
 
             #     else :
             #             self.ui.label_LibsInstallation.setText(f"The environnement doesn't exist, code can't be launch")
-            #             ready = False        
+            #             ready = False
+            if ready:
+                self._wsl_env_ready = True # a failed check is not cached : the user may fix the setup and retry
             return ready
         
     # def creation_env_ali_ios_wsl(self):
@@ -1717,8 +1771,8 @@ class AREGWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
     #         print("result_pythonpath : ",result_pythonpath)
             
     #     if result_pythonpath : 
-    #         conda_exe = self.conda_wsl.getCondaExecutable()
-    #         path_pip = self.conda_wsl.getCondaPath()+f"/envs/{name_env}/bin/pip"
+    #         conda_exe = self.get_conda_executable()
+    #         path_pip = self.get_conda_path()+f"/envs/{name_env}/bin/pip"
     #         # command = [conda_exe, "run", "-n", name_env, "python" ,"-m", f"ALI_IOS_utils.requirement",path_pip] # THIS LINE IS WORKING
     #         command = [conda_exe, "run", "-n", name_env, "python" ,"-m", f"ALI_IOS_utils.requirement",path_pip]
     #         print("command : ",command)
@@ -1729,7 +1783,7 @@ class AREGWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
     
    
     def check_import_wsl(self, name_env, file, class_to_import):
-        conda_exe = self.conda_wsl.getCondaExecutable()
+        conda_exe = self.get_conda_executable()
         command = [
             conda_exe, "run", "-n", name_env, "python", "-c",
             f"\"from {file} import {class_to_import}; print(\"True\")\""
@@ -1746,7 +1800,7 @@ class AREGWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
         Check is wsl now a specifique path (ex : ALI_IOS_utils.requirement) in a specific environment
         return : bool
         '''
-        conda_exe = self.conda_wsl.getCondaExecutable()
+        conda_exe = self.get_conda_executable()
         command = [conda_exe, "run", "-n", name_env, "python" ,"-c", f"\"import {file} as check;import os; print(os.path.isfile(check.__file__))\""]
         print("command : ",command)
         result = self.conda_wsl.condaRunCommand(command)
@@ -1755,6 +1809,25 @@ class AREGWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
             return True
         return False
     
+    def check_pythonpath_windows_multi(self,name_env,files):
+        '''
+        Same as check_pythonpath_windows but probe several modules with one conda run
+        return : dict {file: bool}
+        '''
+        conda_exe = self.get_conda_executable()
+        files_list = ",".join(f"'{file}'" for file in files)
+        command = [conda_exe, "run", "-n", name_env, "python" ,"-c", f"\"import json,importlib.util; print(json.dumps({{f: importlib.util.find_spec(f) is not None for f in [{files_list}]}}))\""]
+        print("command : ",command)
+        result = self.conda_wsl.condaRunCommand(command)
+        print("result = ",result)
+        match = re.search(r"\{.*\}", result)
+        if match :
+            try :
+                return json.loads(match.group(0))
+            except ValueError :
+                pass
+        return {file: False for file in files}
+    
     def give_pythonpath_windows(self,name_env):
         '''
         give all the path of slicer to wsl
@@ -1764,25 +1837,32 @@ class AREGWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
         for path in paths :
             mnt_paths.append(f"\"{self.windows_to_linux_path(path)}\"")
         pythonpath_arg = 'PYTHONPATH=' + ':'.join(mnt_paths)
-        conda_exe = self.conda_wsl.getCondaExecutable()
+        conda_exe = self.get_conda_executable()
         # print("Conda_exe : ",conda_exe)
         argument = [conda_exe, 'env', 'config', 'vars', 'set', '-n', name_env, pythonpath_arg]
         print("arguments : ",argument)
         self.conda_wsl.condaRunCommand(argument)
         
+    def wsl_file_exists(self, path):
+        '''
+        Cheap existence check inside wsl (plain wsl spawn, no conda activation)
+        '''
+        try :
+            return subprocess.run(["wsl", "--", "test", "-e", path], capture_output=True).returncode == 0
+        except OSError :
+            return False
+
     def windows_to_linux_path(self,windows_path):
         '''
         convert a windows path to a wsl path
         '''
         windows_path = windows_path.strip()
 
-        path = windows_path.replace('\\', '/')
-
-        if ':' in path:
-            drive, path_without_drive = path.split(':', 1)
-            path = "/mnt/" + drive.lower() + path_without_drive
+        m = _WIN_DRIVE.match(windows_path)
+        if m:
+            return "/mnt/" + m.group(1).lower() + "/" + m.group(2).replace('\\', '/')
 
-        return path
+        return windows_path.replace('\\', '/')
 
     def cleanup(self):
         """
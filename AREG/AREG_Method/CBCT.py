@@ -1,4 +1,4 @@
-from AREG_Method.Method import Method
+from AREG_Method.Method import Method, getDocumentsFolder
 from AREG_Method.Progress import (
     DisplayAREGCBCT,
     DisplayAMASSS,
@@ -20,8 +20,7 @@ import platform
 class Semi_CBCT(Method):
     def __init__(self, widget):
         super().__init__(widget)
-        documentsLocation = qt.QStandardPaths.DocumentsLocation
-        documents = qt.QStandardPaths.writableLocation(documentsLocation)
+        documents = getDocumentsFolder()
         self.tempAMASSS_folder = os.path.join(
             documents, slicer.app.applicationName + "_temp_AMASSS"
         )
@@ -8,6 +8,9 @@ import vtk
 import shutil
 import platform
 import csv
+import re
+
+_WIN_DRIVE = re.compile(r"^([A-Za-z]):[\\/](.*)$")
 
 
 class Auto_IOS(Method):
@@ -36,13 +39,15 @@ class Auto_IOS(Method):
 
     def TestScan(self, scan_folder_t1: str, scan_folder_t2: str):
         out = ""
+        # search() walks the whole folder : do it once per folder instead of
+        # once per check (the old code also compared T1 against itself)
+        files_t1 = super().search(scan_folder_t1, ".vtk")[".vtk"]
+        files_t2 = super().search(scan_folder_t2, ".vtk")[".vtk"]
         if scan_folder_t1 == "" or scan_folder_t2 == "":
             out = out + "Please select folder with vtk file \n"
-        if len(super().search(scan_folder_t1, ".vtk")[".vtk"]) != len(
-            super().search(scan_folder_t1, ".vtk")[".vtk"]
-        ):
+        if len(files_t1) != len(files_t2):
             out = out + "Please select T1 folder and T2 with the number of vkt files \n"
-        if len(super().search(scan_folder_t1, ".vtk")[".vtk"]) == 0:
+        if len(files_t1) == 0:
             out = out + "Please select folder with vkt files \n"
 
         if out == "":
@@ -86,9 +91,9 @@ class Auto_IOS(Method):
                         if platform.system() != "Windows" :    
                             writer.writerow([os.path.join(root, file)])
                         else :
-                            file_path = os.path.join(root, file)
-                            norm_file_path = os.path.normpath(file_path)
-                            writer.writerow([self.windows_to_linux_path(norm_file_path)])
+                            # build the wsl path directly, no normpath backslash pass to undo
+                            file_path = "/".join([root.replace('\\', '/').rstrip('/'), file])
+                            writer.writerow([self.windows_to_linux_path(file_path)])
 
 
         return csv_file
@@ -99,13 +104,11 @@ class Auto_IOS(Method):
         '''
         windows_path = windows_path.strip()
 
-        path = windows_path.replace('\\', '/')
-
-        if ':' in path:
-            drive, path_without_drive = path.split(':', 1)
-            path = "/mnt/" + drive.lower() + path_without_drive
+        m = _WIN_DRIVE.match(windows_path)
+        if m:
+            return "/mnt/" + m.group(1).lower() + "/" + m.group(2).replace('\\', '/')
 
-        return path
+        return windows_path.replace('\\', '/')
 
     def TestReference(self, ref_folder: str):
 
@@ -1,4 +1,4 @@
-from AREG_Method.Method import Method
+from AREG_Method.Method import Method, getDocumentsFolder
 from AREG_Method.Progress import DisplayAREGIOSCBCT, DisplayALICBCT
 import webbrowser
 import os
@@ -288,8 +288,7 @@ class Auto_IOSCBCT(IOSCBCT):
         print()
 
         # ALI CBCT
-        documentsLocation = qt.QStandardPaths.DocumentsLocation
-        documents = qt.QStandardPaths.writableLocation(documentsLocation)
+        documents = getDocumentsFolder()
         tempALI_folder = os.path.join(
             documents, slicer.app.applicationName + "_temp_ALI"
         )
@@ -3,6 +3,20 @@ import os
 import glob
 import json
 
+_documents_folder = None
+
+
+def getDocumentsFolder():
+    """Return the user's Documents folder, resolved once for all the methods."""
+    global _documents_folder
+    if _documents_folder is None:
+        import qt
+
+        _documents_folder = qt.QStandardPaths.writableLocation(
+            qt.QStandardPaths.DocumentsLocation
+        )
+    return _documents_folder
+
 
 class Method(ABC):
     def __init__(self, widget):
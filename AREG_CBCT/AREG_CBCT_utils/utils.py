@@ -16,7 +16,6 @@ import SimpleITK as sitk
 
 # from slicer.util import pip_install, pip_uninstall
 
-from pkg_resources import working_set
 import dicom2nifti
 import itk
 # if "itk-elastix" in [f"{i.key}" for i in working_set]:
@@ -1,5 +1,6 @@
 import numpy as np
 import vtk
+from vtk.util.numpy_support import vtk_to_numpy
 
 
 def RotationMatrix(axis, theta):
@@ -35,19 +36,6 @@ def RotationMatrix(axis, theta):
     )
 
 
-def TransformSurf(surf, matrix):
-    assert isinstance(surf, vtk.vtkPolyData)
-    surf_copy = vtk.vtkPolyData()
-    surf_copy.DeepCopy(surf)
-    surf = surf_copy
-
-    transform = vtk.vtkTransform()
-    transform.SetMatrix(np.reshape(matrix, 16))
-    surf = RotateTransform(surf, transform)
-
-    return surf
-
-
 def RotateTransform(surf, transform):
 
     transformFilter = vtk.vtkTransformPolyDataFilter()
@@ -63,9 +51,21 @@ def TransformSurf(surf, matrix):
     surf_copy.DeepCopy(surf)
     surf = surf_copy
 
-    transform = vtk.vtkTransform()
-    transform.SetMatrix(np.reshape(matrix, 16))
-    surf = RotateTransform(surf, transform)
+    # apply the matrix on the numpy view of the copy instead of pushing the
+    # mesh through a vtkTransformPolyDataFilter, which would copy every
+    # point and point-data array a second time
+    matrix = np.reshape(np.asarray(matrix), (4, 4))
+    rot = matrix[:3, :3]
+    pts = vtk_to_numpy(surf.GetPoints().GetData())
+    pts[:] = pts @ rot.T + matrix[:3, 3]
+    surf.GetPoints().Modified()
+
+    # the transforms used here are rigid, so normals just rotate
+    normals = surf.GetPointData().GetNormals()
+    if normals is not None:
+        n = vtk_to_numpy(normals)
+        n[:] = n @ rot.T
+        normals.Modified()
 
     return surf
 
@@ -146,30 +146,24 @@ def ScaleSurf(surf, mean_arr=None, scale_factor=None):
     bounds_max_v[1] = max(bounds[2], bounds[3])
     bounds_max_v[2] = max(bounds[4], bounds[5])
 
-    shape_points = []
-    for i in range(shapedatapoints.GetNumberOfPoints()):
-        p = shapedatapoints.GetPoint(i)
-        shape_points.append(p)
-    shape_points = np.array(shape_points)
+    # numpy view on the vtk points array : no per-point GetPoint/SetPoint
+    # round-trips through the interpreter
+    shape_points = vtk_to_numpy(shapedatapoints.GetData())
 
     # centering points of the shape
     if mean_arr is None:
         mean_arr = np.array(mean_v)
     # print("Mean:", mean_arr)
-    shape_points = shape_points - mean_arr
 
     # Computing scale factor if it is not provided
     if scale_factor is None:
         bounds_max_arr = np.array(bounds_max_v)
         scale_factor = 1 / np.linalg.norm(bounds_max_arr - mean_arr)
 
-    # scale points of the shape by scale factor
+    # center and scale in place, the view writes straight into the vtk array
     # print("Scale:", scale_factor)
-    shape_points_scaled = np.multiply(shape_points, scale_factor)
-
-    # assigning scaled points back to shape
-    for i in range(shapedatapoints.GetNumberOfPoints()):
-        shapedatapoints.SetPoint(i, shape_points_scaled[i])
+    shape_points[:] = (shape_points - mean_arr) * scale_factor
+    shapedatapoints.Modified()
 
     surf.SetPoints(shapedatapoints)
 
@@ -1,5 +1,5 @@
 import numpy as np
-from vtk.util.numpy_support import vtk_to_numpy
+from vtk.util.numpy_support import vtk_to_numpy, numpy_to_vtk, numpy_to_vtkIdTypeArray
 import vtk
 
 
@@ -108,19 +108,24 @@ class vtkMeshTeeth(vtkTeeth):
 
         # print(f'list point {list_points}')
         # shuffle(list_points)
+        # build the points and the vertex cells in one shot from numpy
+        # arrays instead of InsertNextPoint/InsertNextCell per vertex
+        all_points = np.concatenate(list_points)[:, 0, :]
         Points = vtk.vtkPoints()
+        Points.SetData(numpy_to_vtk(all_points, deep=1))
+
+        # vertex cells are (1, point_id) pairs
+        cells = np.empty((size, 2), dtype=np.int64)
+        cells[:, 0] = 1
+        cells[:, 1] = np.arange(size)
         Vertices = vtk.vtkCellArray()
+        Vertices.SetCells(size, numpy_to_vtkIdTypeArray(cells.ravel(), deep=1))
+
         labels = vtk.vtkStringArray()
         labels.SetNumberOfValues(size)
         labels.SetName("labels")
-        index = 0
-        for points in list_points:
-            for i in range(points.shape[0]):
-                sp_id = Points.InsertNextPoint(points[i, :].squeeze(0))
-                Vertices.InsertNextCell(1)
-                Vertices.InsertCellPoint(sp_id)
-                labels.SetValue(index, str(index))
-                index += 1
+        for index in range(size):
+            labels.SetValue(index, str(index))
 
         output = vtk.vtkPolyData()
         output.SetPoints(Points)
@@ -15,7 +15,7 @@ from qt import (
     QGridLayout,
     QMediaPlayer,
 )
-import pkg_resources
+import importlib.metadata
 from slicer.ScriptedLoadableModule import *
 from slicer.util import VTKObservationMixin,pip_install
 from functools import partial
@@ -28,11 +28,11 @@ from ASO_Method.Progress import Display
 
 def check_lib_installed(lib_name, required_version=None):
     try:
-        installed_version = pkg_resources.get_distribution(lib_name).version
+        installed_version = importlib.metadata.version(lib_name)
         if required_version and installed_version != required_version:
             return False
         return True
-    except pkg_resources.DistributionNotFound:
+    except importlib.metadata.PackageNotFoundError:
         return False
 
 # import csv
@@ -51,9 +51,8 @@ def install_function():
         user_choice = slicer.util.confirmYesNoDisplay(message)
 
         if user_choice:
-            for lib, version in libs_to_install:
-                lib_version = f'{lib}=={version}' if version else lib
-                pip_install(lib_version)
+            # one pip invocation for all the missing packages : resolver and index are only hit once
+            pip_install(' '.join([f'{lib}=={version}' if version else lib for lib, version in libs_to_install]))
         else :
           return False
     return True
@@ -191,14 +191,16 @@ class Auto_IOS(Method):
         for file in files:
             basename = os.path.basename(file)
             name, extension = os.path.splitext(basename)
-            if self.__isSegmented__(file):
+            # read the surf once : the segmentation check needs it anyway and
+            # the vtk conversion below used to re-parse the same file
+            surf = ReadSurf(file)
+            if self.__isSegmented__(file, surf):
 
                 shutil.copy(file, os.path.join(folder_bypass, basename))
 
             else:
                 if extension != ".vtk":
                     # convert file in vtk because croan segmentation take only vtk file
-                    surf = ReadSurf(file)
                     WriteSurf(surf, folder_toseg, file)
                 else:
                     shutil.copy(file, os.path.join(folder_toseg, basename))
@@ -206,9 +208,10 @@ class Auto_IOS(Method):
 
         return toseg
 
-    def __isSegmented__(self, path):
+    def __isSegmented__(self, path, surf=None):
         properties = ["PredictedID", "UniversalID", "Universal_ID"]
-        surf = ReadSurf(path)
+        if surf is None:
+            surf = ReadSurf(path)
         list_label = [
             surf.GetPointData().GetArrayName(i)
             for i in range(surf.GetPointData().GetNumberOfArrays())
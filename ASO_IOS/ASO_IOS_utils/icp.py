@@ -376,8 +376,15 @@ class vtkTeeth:
 class vtkIterTeeth(vtkTeeth):
     def __init__(self, list_teeth, surf, property=None):
         super().__init__(list_teeth, property)
-        self.CheckLabelSurface(surf, property)
-        if not self.isLabelSurface(surf, self.property):
+        # collect the array names once : CheckLabelSurface + isLabelSurface
+        # each re-walked the whole point data to answer one probe
+        pd = surf.GetPointData()
+        names = [pd.GetArrayName(i) for i in range(pd.GetNumberOfArrays())]
+        if property not in names:
+            # same fallback as GetLabelSurface (it ends on the last array)
+            property = names[-1] if names else None
+        self.property = property
+        if self.property not in names:
             raise NoSegmentationSurf(self.property)
         self.region_id = vtk_to_numpy(surf.GetPointData().GetScalars(self.property))
         self.verts = vtk_to_numpy(surf.GetPoints().GetData())
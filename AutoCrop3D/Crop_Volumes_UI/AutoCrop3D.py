@@ -825,12 +825,16 @@ class AutoCrop3DLogic(ScriptedLoadableModuleLogic):
         Called when the logic class is instantiated. Can be used for initializing member variables.
         """
         ScriptedLoadableModuleLogic.__init__(self)
-        self.scan_files_path = scan_files_path
-        self.path_ROI_file = path_ROI_file
-        self.output_path = output_path
-        self.suffix = suffix
-        self.box_Size = box_Size
-        self.logPath = logPath
+        # the cli parameters never change after construction : build the dict
+        # once here instead of re-assembling it on every process() call
+        self.parameters = {
+            "scan_files_path": scan_files_path,
+            "path_ROI_file": path_ROI_file,
+            "output_path": output_path,
+            "suffix": suffix,
+            "box_Size": box_Size,
+            "logPath": logPath,
+        }
 
         self.cliNode = None
         self.installCliNode = None
@@ -849,18 +853,8 @@ class AutoCrop3DLogic(ScriptedLoadableModuleLogic):
         """
         Run the processing algorithm.
         """
-        parameters = {}
-
-        parameters ["scan_files_path"] = self.scan_files_path
-        parameters ["path_ROI_file"] = self.path_ROI_file
-        parameters ["output_path"] = self.output_path
-        parameters ["suffix"] = self.suffix
-        parameters["box_Size"] = self.box_Size
-        parameters ["logPath"] = self.logPath
-
-
         CLI_autoCrop3D = slicer.modules.autocrop3d_cli
-        self.cliNode = slicer.cli.run(CLI_autoCrop3D,None, parameters)
+        self.cliNode = slicer.cli.run(CLI_autoCrop3D,None, self.parameters)
 
         return CLI_autoCrop3D
 
@@ -455,80 +455,103 @@ class AutoMatrixWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
         Function that will apply the matrix to all the files
         '''
 
-        patients,nb_files = GetPatients(self.ui.LineEditPatient.text,self.ui.LineEditMatrix.text)
+        # read the lineedits and stat the folders once, not per scan/matrix pair
+        patient_text = self.ui.LineEditPatient.text
+        matrix_text = self.ui.LineEditMatrix.text
+        output_text = self.ui.LineEditOutput.text
+        suffix_text = self.ui.LineEditSuffix.text
+        patient_is_dir = Path(patient_text).is_dir()
+        matrix_is_dir = Path(matrix_text).is_dir()
+
+        patients,nb_files = GetPatients(patient_text,matrix_text)
 
         if nb_files!=0:
-            for key,values in patients.items():
-                for scan in values['scan']:
-                    fname, extension_scan = os.path.splitext(scan)
-                    try :
-                        fname, extension2 = os.path.splitext(os.path.basename(fname))
-                        extension_scan = extension2+extension_scan
-                    except :
-                        print("not a .nii.gz")
-
-                    self.UpdateTime()
-                    if extension_scan!=".nii.gz" and extension_scan!=".nrrd":
-                        model = slicer.util.loadModel(scan)
-                    else :
-                        model = slicer.util.loadVolume(scan)
-                    self.UpdateTime()
-                    for matrix in values['matrix']:
-                        try:
-                            self.UpdateTime()
-                            fname, extension_mat = os.path.splitext(os.path.basename(matrix))
-                            if extension_mat==".npy":
-                                array = np.load(matrix)
-                                tform = slicer.mrmlScene.AddNewNodeByClass('vtkMRMLTransformNode')
-                                tform.SetMatrixTransformToParent(slicer.util.vtkMatrixFromArray(array))
-
-                            else :
-                                tform = slicer.util.loadTransform(matrix)
-
-                            if Path(self.ui.LineEditPatient.text).is_dir():
-                                    outpath = scan.replace(self.ui.LineEditPatient.text,self.ui.LineEditOutput.text)
-                            else :
-                                outpath = scan.replace(os.path.dirname(self.ui.LineEditPatient.text),self.ui.LineEditOutput.text)
-
-                            try :
-                                if Path(self.ui.LineEditMatrix.text).is_dir():
-                                    matrix_name = os.path.basename(matrix).split(extension_mat)[0].split(key)[1]
-                                else :
-                                    matrix_name = os.path.basename(matrix).split(extension_mat)[0]
-                            except :
-                                print('Impossible to extract the name of the matrix')
-                                matrix_name="matrix_name"
+            # batch state : suppress per-node render/displayable-manager updates
+            # while we load, harden and remove the transient nodes
+            slicer.mrmlScene.StartState(slicer.mrmlScene.BatchProcessState)
+            try:
+                for key,values in patients.items():
+                    for scan in values['scan']:
+                        fname, extension_scan = os.path.splitext(scan)
+                        try :
+                            fname, extension2 = os.path.splitext(os.path.basename(fname))
+                            extension_scan = extension2+extension_scan
+                        except :
+                            print("not a .nii.gz")
+
+                        self.UpdateTime()
+                        if extension_scan!=".nii.gz" and extension_scan!=".nrrd":
+                            model = slicer.util.loadModel(scan)
+                        else :
+                            model = slicer.util.loadVolume(scan)
+                        self.UpdateTime()
+                        for matrix in values['matrix']:
+                            try:
+                                self.UpdateTime()
+                                fname, extension_mat = os.path.splitext(os.path.basename(matrix))
+                                if extension_mat==".npy":
+                                    array = np.load(matrix)
+                                    tform = slicer.mrmlScene.AddNewNodeByClass('vtkMRMLTransformNode')
+                                    tform.SetMatrixTransformToParent(slicer.util.vtkMatrixFromArray(array))
 
-                            if not os.path.exists(os.path.dirname(outpath)):
-                                os.makedirs(os.path.dirname(outpath))
+                                else :
+                                    tform = slicer.util.loadTransform(matrix)
 
-                            self.UpdateTime()
-                            model.SetAndObserveTransformNodeID(tform.GetID())
-                            model.HardenTransform()
-                            self.UpdateTime()
+                                if patient_is_dir:
+                                        outpath = scan.replace(patient_text,output_text)
+                                else :
+                                    outpath = scan.replace(os.path.dirname(patient_text),output_text)
 
-                            original_stdin = sys.stdin
-                            sys.stdin = DummyFile()
+                                try :
+                                    if matrix_is_dir:
+                                        matrix_name = os.path.basename(matrix).split(extension_mat)[0].split(key)[1]
+                                    else :
+                                        matrix_name = os.path.basename(matrix).split(extension_mat)[0]
+                                except :
+                                    print('Impossible to extract the name of the matrix')
+                                    matrix_name="matrix_name"
 
-                            process =  threading.Thread(target=self.saveOutput, args=(model,outpath.split(extension_scan)[0]+self.ui.LineEditSuffix.text+matrix_name+extension_scan,))
-                            process.start()
+                                if not os.path.exists(os.path.dirname(outpath)):
+                                    os.makedirs(os.path.dirname(outpath))
 
-                            while process.is_alive():
-                                slicer.app.processEvents()
                                 self.UpdateTime()
+                                # one ModifiedEvent for the observe+harden pair
+                                wasModified = model.StartModify()
+                                model.SetAndObserveTransformNodeID(tform.GetID())
+                                model.HardenTransform()
+                                model.EndModify(wasModified)
+                                # the matrix is baked in : drop the transform
+                                # node, it used to leak one per matrix
+                                slicer.mrmlScene.RemoveNode(tform)
+                                self.UpdateTime()
+
+                                original_stdin = sys.stdin
+                                sys.stdin = DummyFile()
+
+                                # strip the extension from the end only : split(extension_scan)
+                                # mangled paths containing the extension as a substring
+                                save_path = outpath[:-len(extension_scan)]+suffix_text+matrix_name+extension_scan
+                                process =  threading.Thread(target=self.saveOutput, args=(model,save_path,))
+                                process.start()
 
-                            sys.stdin = original_stdin
-                            self.UpdateTime()
+                                while process.is_alive():
+                                    slicer.app.processEvents()
+                                    self.UpdateTime()
+
+                                sys.stdin = original_stdin
+                                self.UpdateTime()
 
 
 
-                        except Exception as e:
-                            print("An issue occured : ",e)
-                            pass
-                    self.UpdateProgressBar(False)
-                    self.UpdateTime()
-                    slicer.mrmlScene.RemoveNode(model)
-                    self.UpdateTime()
+                            except Exception as e:
+                                print("An issue occured : ",e)
+                                pass
+                        self.UpdateProgressBar(False)
+                        self.UpdateTime()
+                        slicer.mrmlScene.RemoveNode(model)
+                        self.UpdateTime()
+            finally:
+                slicer.mrmlScene.EndState(slicer.mrmlScene.BatchProcessState)
 
 
 
@@ -556,8 +579,13 @@ class AutoMatrixWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
         current_time = time.time()
         elapsed_time = current_time - self.start_time
         gap = current_time - self.previous_time
-        if gap>0.5:
-            self.ui.label_time.setText(f"time : {round(elapsed_time,2)}s")
+        # repaint at most once per second, and only when the displayed
+        # second changed : this runs several times per scan/matrix pair
+        if gap>1.0:
+            sec = int(elapsed_time)
+            if sec != getattr(self, "_last_time_sec", -1):
+                self._last_time_sec = sec
+                self.ui.label_time.setText(f"time : {sec}s")
             self.previous_time = current_time
 
 
@@ -635,22 +663,29 @@ class AutoMatrixWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
         """
 
         warning_text = ""
+        # each .text / currentIndex access crosses the PythonQt boundary :
+        # read the widgets once for the whole validation
+        patient_text = self.ui.LineEditPatient.text
+        matrix_text = self.ui.LineEditMatrix.text
+        patient_index = self.ui.ComboBoxPatient.currentIndex
+        matrix_index = self.ui.ComboBoxMatrix.currentIndex
+        mirror_checked = self.ui.CheckBoxMirror.isChecked()
         if self.ui.LineEditOutput.text=="":
             warning_text = warning_text + "Enter folder output" + "\n"
 
-        if self.ui.LineEditPatient.text=="":
-            if self.ui.ComboBoxPatient.currentIndex==1 : # folder option
+        if patient_text=="":
+            if patient_index==1 : # folder option
                 warning_text = warning_text + "Enter folder patients" + "\n"
-            elif self.ui.ComboBoxPatient.currentIndex==0 : # file option
+            elif patient_index==0 : # file option
                 warning_text = warning_text + "Enter file patient" + "\n"
         else :
-            if self.ui.ComboBoxPatient.currentIndex==1 : #folder option
-                self.dico_patient=search(self.ui.LineEditPatient.text,'.vtk','.vtp','.stl','.off','.obj','.nii.gz','nrrd')
+            if patient_index==1 : #folder option
+                self.dico_patient=search(patient_text,'.vtk','.vtp','.stl','.off','.obj','.nii.gz','nrrd')
                 if len(self.dico_patient['.vtk'])==0 and len(self.dico_patient['.vtp']) and len(self.dico_patient['.stl']) and len(self.dico_patient['.off']) and len(self.dico_patient['.obj']) and len(self.dico_patient['.nii.gz']) and len(self.dico_patient['.nrrd']) :
                     warning_text = warning_text + "Folder empty or wrong type of file patient" + "\n"
                     warning_text = warning_text + "File authorized : .vtk / .vtp / .stl / .off / .obj / .nii.gz / .nrrd" + "\n"
-            elif self.ui.ComboBoxPatient.currentIndex==0 : # file option
-                fname, extension = os.path.splitext(os.path.basename(self.ui.LineEditPatient.text))
+            elif patient_index==0 : # file option
+                fname, extension = os.path.splitext(os.path.basename(patient_text))
                 try :
                     fname, extension2 = os.path.splitext(os.path.basename(fname))
                     extension = extension2+extension
@@ -661,19 +696,19 @@ class AutoMatrixWidget(ScriptedLoadableModuleWidget, VTKObservationMixin):
                         warning_text = warning_text + "File authorized : .vtk / .vtp / .stl / .off / .obj / .nii.gz / .nrrd" + "\n"
 
 
-        if self.ui.LineEditMatrix.text=="":
-            if self.ui.ComboBoxMatrix.currentIndex==1 : # folder option
+        if matrix_text=="":
+            if matrix_index==1 : # folder option
                 warning_text = warning_text + "Enter folder matrix" + "\n"
-            elif self.ui.ComboBoxMatrix.currentIndex==0 and self.ui.CheckBoxMirror.isChecked()==False : # file option
+            elif matrix_index==0 and mirror_checked==False : # file option
                 warning_text = warning_text + "Enter file matrix" + "\n"
         else :
-            if self.ui.ComboBoxMatrix.currentIndex==1 : # folder option
-                dico_matrix=search(self.ui.LineEditMatrix.text,'.npy','.h5','.tfm','.mat','.txt')
+            if matrix_index==1 : # folder option
+                dico_matrix=search(matrix_text,'.npy','.h5','.tfm','.mat','.txt')
                 if len(dico_matrix['.npy'])==0 and len(dico_matrix['.h5'])==0 and len(dico_matrix['.tfm'])==0 and len(dico_matrix['.mat'])==0 and len(dico_matrix['.txt'])==0 :
                     warning_text = warning_text + "Folder empty or wrong type of files matrix " + "\n"
                     warning_text = warning_text + "File authorized : .npy / .h5 / .tfm / . mat / .txt" + "\n"
-            elif self.ui.ComboBoxMatrix.currentIndex==0 and self.ui.CheckBoxMirror.isChecked()==False: # file option
-                fname, extension = os.path.splitext(os.path.basename(self.ui.LineEditMatrix.text))
+            elif matrix_index==0 and mirror_checked==False: # file option
+                fname, extension = os.path.splitext(os.path.basename(matrix_text))
                 if extension != ".npy"  and extension != ".h5" and extension != ".tfm" and extension != ".mat" and extension != ".txt":
                         warning_text = warning_text + "Wrong type of file matrix detect" + "\n"
                         warning_text = warning_text + "File authorized : .npy / .h5 / .tfm / . mat / .txt" + "\n"
@@ -709,11 +744,15 @@ class AutoMatrixLogic(ScriptedLoadableModuleLogic):
         Called when the logic class is instantiated. Can be used for initializing member variables.
         """
         ScriptedLoadableModuleLogic.__init__(self)
-        self.path_patient_intput = path_patient_intput
-        self.path_matrix_intput = path_matrix_intput
-        self.path_patient_output = path_patient_output
-        self.suffix = suffix
-        self.logPath = logPath
+        # keep the run parameters in one dict instead of one attribute each,
+        # same layout as the AutoCrop3D logic
+        self.parameters = {
+            "path_patient_intput": path_patient_intput,
+            "path_matrix_intput": path_matrix_intput,
+            "path_patient_output": path_patient_output,
+            "suffix": suffix,
+            "logPath": logPath,
+        }
         self.cliNode = None
         self.installCliNode = None
 